@@ -16,6 +16,7 @@
 import json
 import logging
 import secrets
+import time
 from typing import Any, Union
 
 from requests import codes
@@ -24,6 +25,8 @@ from requests.models import HTTPError
 from sunbeam.clusterd import service
 
 LOG = logging.getLogger(__name__)
+# Seconds a list_nodes_by_role answer is reused before querying clusterd again
+NODES_BY_ROLE_CACHE_TTL = 5
 
 
 class MicroClusterService(service.BaseService):
@@ -108,6 +111,14 @@ class MicroClusterService(service.BaseService):
 class ExtendedAPIService(service.BaseService):
     """Client for Sunbeam extended Cluster API."""
 
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._nodes_by_role_cache: dict[str, tuple[float, list]] = {}
+
+    def _invalidate_nodes_cache(self) -> None:
+        """Drop cached node listings after a node mutation."""
+        self._nodes_by_role_cache.clear()
+
     def add_node_info(
         self, name: str, role: list[str], machineid: int = -1, systemid: str = ""
     ) -> None:
@@ -119,6 +130,7 @@ class ExtendedAPIService(service.BaseService):
             "systemid": systemid,
         }
         self._post("/1.0/nodes", data=json.dumps(data))
+        self._invalidate_nodes_cache()
 
     def list_nodes(self) -> list[dict]:
         """List all nodes."""
@@ -132,6 +144,7 @@ class ExtendedAPIService(service.BaseService):
     def remove_node_info(self, name: str) -> None:
         """Remove Node information from cluster database."""
         self._delete(f"1.0/nodes/{name}")
+        self._invalidate_nodes_cache()
 
     def update_node_info(
         self,
@@ -143,6 +156,7 @@ class ExtendedAPIService(service.BaseService):
         """Update role and machineid for node."""
         data = {"role": role, "machineid": machineid, "systemid": systemid}
         self._put(f"1.0/nodes/{name}", data=json.dumps(data))
+        self._invalidate_nodes_cache()
 
     def add_juju_user(self, name: str, token: str) -> None:
         """Add juju user to cluster database."""
@@ -181,11 +195,20 @@ class ExtendedAPIService(service.BaseService):
         self._delete(f"/1.0/config/{key}")
 
     def list_nodes_by_role(self, role: Union[str, list[str]]) -> list:
-        """List nodes by role."""
+        """List nodes by role.
+
+        Answers are cached for NODES_BY_ROLE_CACHE_TTL seconds, node
+        mutations made through this service invalidate the cache.
+        """
         if isinstance(role, list):
             role = "&role=".join(role)
-        nodes = self._get(f"/1.0/nodes?role={role}")
-        return nodes.get("metadata")
+        now = time.monotonic()
+        cached = self._nodes_by_role_cache.get(role)
+        if cached is not None and now - cached[0] < NODES_BY_ROLE_CACHE_TTL:
+            return list(cached[1])
+        nodes = self._get(f"/1.0/nodes?role={role}").get("metadata") or []
+        self._nodes_by_role_cache[role] = (now, nodes)
+        return list(nodes)
 
     def list_terraform_plans(self) -> list[str]:
         """List all plans."""
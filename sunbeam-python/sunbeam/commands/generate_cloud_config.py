@@ -35,6 +35,7 @@ from sunbeam.core.common import (
     Result,
     ResultType,
     Status,
+    YamlDumper,
     run_plan,
 )
 from sunbeam.core.deployment import Deployment
@@ -177,12 +178,16 @@ class GenerateCloudConfigStep(BaseStep):
         shutil.copy(clouds_yaml, clouds_yaml_backup)
         clouds_yaml_backup.chmod(0o660)
 
+    def _render_clouds_yaml(self, cloud_config: dict) -> str:
+        """Render clouds.yaml content."""
+        return yaml.dump(cloud_config, Dumper=YamlDumper)
+
     def _print_cloud_config(self, tf_output: dict = {}) -> None:
         """Prints cloud config on stdout or cloud-file."""
         generated_cloud_config = self._generate_cloud_config(self.is_admin, tf_output)
         if not self.update:
             cloud_config = {"clouds": generated_cloud_config}
-            console.print(yaml.safe_dump(cloud_config))
+            console.print(self._render_clouds_yaml(cloud_config))
             return
 
         cloud_config_from_file = self._get_cloud_config_from_file(self.cloudfile)
@@ -212,8 +217,7 @@ class GenerateCloudConfigStep(BaseStep):
             # Update clouds.yaml with the generated information
             cloud_config_from_file.setdefault("clouds", {})
             cloud_config_from_file["clouds"].update(generated_cloud_config)
-            with self.cloudfile.open("w") as file:
-                yaml.safe_dump(cloud_config_from_file, file)
+            self.cloudfile.write_text(self._render_clouds_yaml(cloud_config_from_file))
             console.print(f"{message}[green]done[/green]")
 
 
@@ -20,6 +20,7 @@ import json
 import logging
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Sequence
 
@@ -57,6 +58,31 @@ def run_preflight_checks(checks: Sequence["Check"], console: Console):
                 raise click.ClickException(check.message)
 
 
+def run_preflight_checks_parallel(checks: Sequence["Check"], console: Console):
+    """Run preflight checks concurrently.
+
+    Checks must be independent of each other. Results are evaluated in
+    the original order so the reported failure is the same one that
+    run_preflight_checks would report.
+
+    Raise ClickException in case of Result Failures.
+    """
+    if len(checks) <= 1:
+        run_preflight_checks(checks, console)
+        return
+
+    for check in checks:
+        LOG.debug(f"Starting pre-flight check {check.name}")
+    message = ", ".join(check.description for check in checks) + " ... "
+    with console.status(message):
+        with ThreadPoolExecutor(max_workers=len(checks)) as executor:
+            results = list(executor.map(lambda check: check.run(), checks))
+
+    for check, passed in zip(checks, results):
+        if not passed:
+            raise click.ClickException(check.message)
+
+
 class Check:
     """Base class for Pre-flight checks.
 
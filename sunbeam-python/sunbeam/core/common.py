@@ -404,7 +404,16 @@ async def update_status_background(
     return asyncio.create_task(_update_status_background_coro())
 
 
-def str_presenter(dumper: yaml.Dumper | yaml.SafeDumper, data: str) -> yaml.ScalarNode:
+# libyaml backed dumper when available, same output as the pure Python one
+try:
+    from yaml import CSafeDumper as YamlDumper  # noqa: F401
+except ImportError:
+    from yaml import SafeDumper as YamlDumper  # type: ignore[assignment] # noqa: F401
+
+
+def str_presenter(
+    dumper: yaml.representer.SafeRepresenter, data: str
+) -> yaml.ScalarNode:
     """Return multiline string as '|' literal block.
 
     Ref: https://stackoverflow.com/questions/8640959/how-can-i-control-what-scalar-form-pyyaml-uses-for-my-data
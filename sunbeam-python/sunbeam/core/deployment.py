@@ -18,6 +18,7 @@ import enum
 import logging
 import pathlib
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from typing import TYPE_CHECKING, Type
 
 import pydantic
@@ -355,13 +356,25 @@ class Deployment(pydantic.BaseModel):
         env.update(self._get_juju_clusterd_env())
         env.update(self.get_proxy_settings())
 
-        for tfplan, tf_manifest in terraform_plans.items():
-            tfplan_dir = TERRAFORM_DIR_NAMES.get(tfplan, tfplan)
-            src = tf_manifest.source
-            dst = self.plans_directory / tfplan_dir
+        plans_directory = self.plans_directory
+        plan_dirs = {
+            tfplan: plans_directory / TERRAFORM_DIR_NAMES.get(tfplan, tfplan)
+            for tfplan in terraform_plans
+        }
+
+        def _copy_plan(tfplan: str):
+            src = terraform_plans[tfplan].source
+            dst = plan_dirs[tfplan]
             LOG.debug(f"Updating {dst} from {src}...")
             shutil.copytree(src, dst, dirs_exist_ok=True)
 
+        # Plans are copied into distinct directories, overlap the copies
+        if plan_dirs:
+            with ThreadPoolExecutor(max_workers=len(plan_dirs)) as executor:
+                # Consume results to re-raise any copy error
+                list(executor.map(_copy_plan, plan_dirs))
+
+        for tfplan, dst in plan_dirs.items():
             self._tfhelpers[tfplan] = TerraformHelper(
                 path=dst,
                 plan=tfplan,
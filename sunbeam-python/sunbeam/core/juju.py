@@ -136,9 +136,15 @@ class TimeoutException(JujuException):
 
 
 class ActionFailedException(JujuException):
-    """Raised when Juju run failed."""
+    """Raised when Juju run failed.
 
-    pass
+    The structured action results, if any, are kept in `results`.
+    """
+
+    def __init__(self, *args, results: dict | None = None, status: str | None = None):
+        super().__init__(*args)
+        self.results: dict = results or {}
+        self.status = status
 
 
 class CmdFailedException(JujuException):
@@ -686,7 +692,11 @@ class JujuHelper:
         await action_obj.wait()
         if action_obj._status != "completed":
             output = await model_impl.get_action_output(action_obj.id)
-            raise ActionFailedException(output)
+            raise ActionFailedException(
+                output,
+                results=output if isinstance(output, dict) else None,
+                status=action_obj._status,
+            )
 
         return action_obj.results
 
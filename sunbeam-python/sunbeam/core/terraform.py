@@ -17,6 +17,7 @@ import json
 import logging
 import os
 import subprocess
+import time
 from datetime import datetime
 from pathlib import Path
 from string import Template
@@ -31,6 +32,7 @@ from sunbeam.core.manifest import Manifest
 
 LOG = logging.getLogger(__name__)
 TERRAFORM_APPLY_TIMEOUT = 1200  # 20 minutes
+TERRAFORM_OUTPUT_CACHE_TTL = 30  # seconds
 
 http_backend_template = """
 terraform {
@@ -90,6 +92,7 @@ class TerraformHelper:
         self.backend = backend or "local"
         self.terraform = str(self.snap.paths.snap / "bin" / "terraform")
         self.clusterd_address = clusterd_address
+        self._output_cache: tuple[float, dict] | None = None
 
     def backend_config(self) -> dict:
         """Get backend configuration for terraform."""
@@ -188,6 +191,7 @@ class TerraformHelper:
 
     def apply(self, extra_args: list | None = None):
         """Terraform apply."""
+        self.invalidate_output_cache()
         os_env = os.environ.copy()
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         tf_log = str(self.path / f"terraform-apply-{timestamp}.log")
@@ -223,6 +227,7 @@ class TerraformHelper:
 
     def destroy(self):
         """Terraform destroy."""
+        self.invalidate_output_cache()
         os_env = os.environ.copy()
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         tf_log = str(self.path / f"terraform-destroy-{timestamp}.log")
@@ -294,6 +299,26 @@ class TerraformHelper:
             LOG.warning(e.stderr)
             raise TerraformException(str(e))
 
+    def cached_output(self, hide_output: bool = False) -> dict:
+        """Terraform output, reused for TERRAFORM_OUTPUT_CACHE_TTL seconds.
+
+        The cache is dropped by any command modifying the state.
+        """
+        now = time.monotonic()
+        if (
+            self._output_cache is not None
+            and now - self._output_cache[0] < TERRAFORM_OUTPUT_CACHE_TTL
+        ):
+            LOG.debug(f"Using cached terraform output for plan {self.plan}")
+            return dict(self._output_cache[1])
+        output = self.output(hide_output)
+        self._output_cache = (now, output)
+        return dict(output)
+
+    def invalidate_output_cache(self) -> None:
+        """Drop cached terraform output."""
+        self._output_cache = None
+
     def pull_state(self) -> dict:
         """Pull the Terraform state."""
         os_env = os.environ.copy()
@@ -355,6 +380,7 @@ class TerraformHelper:
 
     def state_rm(self, resource: str) -> None:
         """Remove a resource from Terraform state."""
+        self.invalidate_output_cache()
         os_env = os.environ.copy()
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         tf_log = str(self.path / f"terraform-state-rm-{timestamp}.log")
@@ -384,6 +410,7 @@ class TerraformHelper:
 
     def sync(self) -> None:
         """Sync the running state back to the Terraform state file."""
+        self.invalidate_output_cache()
         os_env = os.environ.copy()
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
         tf_log = str(self.path / f"terraform-sync-{timestamp}.log")
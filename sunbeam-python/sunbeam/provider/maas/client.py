@@ -16,6 +16,7 @@
 """MAAS management."""
 
 import collections
+import functools
 import logging
 from typing import Sequence, overload
 
@@ -35,11 +36,21 @@ LOG = logging.getLogger(__name__)
 console = Console()
 
 
+@functools.lru_cache(maxsize=None)
+def _connect(url: str, token: str):
+    """Connect to MAAS, reusing the session for the rest of the process.
+
+    connect fetches the API description from MAAS, commands and checks
+    building several clients for the same deployment share one session.
+    """
+    return connect(url, apikey=token)
+
+
 class MaasClient:
     """Facade to MAAS APIs."""
 
     def __init__(self, url: str, token: str, resource_tag: str | None = None):
-        self._client = connect(url, apikey=token)
+        self._client = _connect(url, token)
         self.resource_tag = resource_tag
 
     def ensure_tag(self, tag: str):
@@ -114,14 +125,21 @@ class MaasClient:
 
         Only list reserved types as it is the only one we are interested in.
         """
+        return self.list_reserved_ip_ranges().get(subnet["id"], [])
+
+    def list_reserved_ip_ranges(self) -> dict[int, list[dict]]:
+        """List reserved ip ranges, grouped by subnet id.
+
+        A single MAAS query, to be used when ranges for several subnets
+        are needed.
+        """
         ip_ranges_response: list = self._client.ip_ranges.list()  # type: ignore
 
-        subnet_id = subnet["id"]
-        ip_ranges = []
+        ip_ranges: dict[int, list[dict]] = collections.defaultdict(list)
         for ip_range in ip_ranges_response:
-            if ip_range.subnet.id == subnet_id and ip_range.type.value == "reserved":
-                ip_ranges.append(ip_range._data)
-        return ip_ranges
+            if ip_range.type.value == "reserved":
+                ip_ranges[ip_range.subnet.id].append(ip_range._data)
+        return dict(ip_ranges)
 
     def get_dns_servers(self) -> list[str]:
         """Get configured upstream dns."""
@@ -417,9 +435,12 @@ def get_ip_ranges_from_space(client: MaasClient, space: str) -> dict[str, list[d
     Return a dict with the CIDR as key and a list of IP ranges as value.
     """
     subnets = client.get_subnets(space)
+    if not subnets:
+        return {}
+    reserved_ranges = client.list_reserved_ip_ranges()
     ip_ranges = {}
     for subnet in subnets:
-        ranges_raw = client.get_ip_ranges(subnet)
+        ranges_raw = reserved_ranges.get(subnet["id"], [])
         ranges = []
         for ip_range in ranges_raw:
             ranges.append(_convert_raw_ip_range(ip_range))
@@ -17,13 +17,15 @@
 import json
 import logging
 import sys
-from collections import Counter
+import time
 from datetime import datetime
+from functools import update_wrapper
 from pathlib import Path
 from typing import Sequence, Tuple, Type
 
 import click
 import yaml
+from maas.client import bones  # type: ignore [import-untyped]
 from rich.console import Console
 from rich.table import Table
 from snaphelpers import Snap
@@ -48,6 +50,7 @@ from sunbeam.core.checks import (
     VerifyBootstrappedCheck,
     VerifyClusterdNotBootstrappedCheck,
     run_preflight_checks,
+    run_preflight_checks_parallel,
 )
 from sunbeam.core.common import (
     CLICK_FAIL,
@@ -57,6 +60,7 @@ from sunbeam.core.common import (
     FORMAT_TABLE,
     FORMAT_YAML,
     BaseStep,
+    YamlDumper,
     get_step_message,
     run_plan,
     str_presenter,
@@ -190,6 +194,15 @@ from sunbeam.utils import (
 
 LOG = logging.getLogger(__name__)
 console = Console()
+MAAS_CHECK_ATTEMPTS = 3
+MAAS_CHECK_BACKOFF = 0.25
+
+
+class _ReportDumper(YamlDumper):
+    """Dumper for validation reports, multiline strings as literal blocks."""
+
+
+yaml.add_representer(str, str_presenter, Dumper=_ReportDumper)
 
 
 @click.group("cluster", context_settings=CONTEXT_SETTINGS, cls=CatchGroup)
@@ -301,13 +314,14 @@ def bootstrap(
     LOG.debug(f"Manifest used for deployment - core: {manifest.core}")
     LOG.debug(f"Manifest used for deployment - features: {manifest.features}")
 
-    deployments = DeploymentsConfig.load(deployment_path(Snap()))
+    snap = Snap()
+    deployments = DeploymentsConfig.load(deployment_path(snap))
 
     preflight_checks: list[Check] = []
     preflight_checks.append(JujuSnapCheck())
     preflight_checks.append(LocalShareCheck())
     preflight_checks.append(VerifyClusterdNotBootstrappedCheck())
-    run_preflight_checks(preflight_checks, console)
+    run_preflight_checks_parallel(preflight_checks, console)
 
     maas_client = MaasClient.from_deployment(deployment)
 
@@ -318,9 +332,11 @@ def bootstrap(
     preflight_checks = []
     preflight_checks.append(NetworkMappingCompleteCheck(deployment))
     preflight_checks.append(JujuControllerCheck(deployment, juju_controller))
+    # JujuControllerCheck queries MAAS through python-libmaas, whose sync
+    # wrappers need the main thread event loop.
     run_preflight_checks(preflight_checks, console)
 
-    data_location = Snap().paths.user_data
+    data_location = snap.paths.user_data
     cloud_definition = JujuHelper.maas_cloud(deployment.name, deployment.url)
     credentials_definition = JujuHelper.maas_credential(
         cloud=deployment.name,
@@ -486,10 +502,47 @@ def bootstrap(
     console.print("Bootstrap controller components complete.")
 
 
+def _local_share_checked(f):
+    """Run the LocalShareCheck preflight check before the command."""
+
+    def new_func(*args, **kwargs):
+        run_preflight_checks([LocalShareCheck()], console)
+        return f(*args, **kwargs)
+
+    return update_wrapper(new_func, f)
+
+
 def _name_mapper(node: dict) -> str:
     return node["name"]
 
 
+def _bucket_nodes_by_role(
+    nodes: list[dict],
+) -> tuple[list[str], list[str], list[str], list[str]]:
+    """Split clusterd nodes into control, compute, storage and workers.
+
+    Workers are the nodes holding at least one of those roles, listed once
+    each in clusterd order.
+    """
+    control: list[str] = []
+    compute: list[str] = []
+    storage: list[str] = []
+    workers: dict[str, None] = {}
+    buckets = (
+        (RoleTags.CONTROL.value, control),
+        (RoleTags.COMPUTE.value, compute),
+        (RoleTags.STORAGE.value, storage),
+    )
+    for node in nodes:
+        name = node["name"]
+        roles = node.get("role") or ()
+        for role, bucket in buckets:
+            if role in roles:
+                bucket.append(name)
+                workers[name] = None
+    return control, compute, storage, list(workers)
+
+
 @click.command()
 @click.option("-a", "--accept-defaults", help="Accept all defaults.", is_flag=True)
 @click.option(
@@ -518,7 +571,7 @@ def deploy(
     preflight_checks.append(JujuSnapCheck())
     preflight_checks.append(LocalShareCheck())
     preflight_checks.append(VerifyClusterdNotBootstrappedCheck())
-    run_preflight_checks(preflight_checks, console)
+    run_preflight_checks_parallel(preflight_checks, console)
 
     if (
         deployment.clusterd_address is None
@@ -584,19 +637,13 @@ def deploy(
     )
     run_plan(plan, console, show_hints)
 
-    control = list(
-        map(_name_mapper, client.cluster.list_nodes_by_role(RoleTags.CONTROL.value))
+    # Single clusterd round trip, nodes are bucketed by role client-side
+    control, compute, storage, workers = _bucket_nodes_by_role(
+        client.cluster.list_nodes()
     )
     nb_control = len(control)
-    compute = list(
-        map(_name_mapper, client.cluster.list_nodes_by_role(RoleTags.COMPUTE.value))
-    )
     nb_compute = len(compute)
-    storage = list(
-        map(_name_mapper, client.cluster.list_nodes_by_role(RoleTags.STORAGE.value))
-    )
     nb_storage = len(storage)
-    workers = list(set(compute + control + storage))
 
     if nb_control < 1 or nb_compute < 1 or nb_storage < 1:
         console.print(
@@ -874,7 +921,7 @@ def add_maas(name: str, token: str, url: str, show_hints: bool) -> None:
         LocalShareCheck(),
         VerifyClusterdNotBootstrappedCheck(),
     ]
-    run_preflight_checks(preflight_checks, console)
+    run_preflight_checks_parallel(preflight_checks, console)
 
     snap = Snap()
     path = deployment_path(snap)
@@ -903,13 +950,9 @@ def add_maas(name: str, token: str, url: str, show_hints: bool) -> None:
     help="Output format",
 )
 @click.pass_context
+@_local_share_checked
 def list_machines_cmd(ctx: click.Context, format: str) -> None:
     """List machines in active deployment."""
-    preflight_checks = [
-        LocalShareCheck(),
-    ]
-    run_preflight_checks(preflight_checks, console)
-
     deployment: MaasDeployment = ctx.obj
     client = MaasClient.from_deployment(deployment)
     machines = list_machines(client)
@@ -927,7 +970,7 @@ def list_machines_cmd(ctx: click.Context, format: str) -> None:
             table.add_row(hostname, roles, zone, status)
         console.print(table)
     elif format == FORMAT_YAML:
-        console.print(yaml.dump(machines), end="")
+        yaml.dump(machines, sys.stdout, Dumper=YamlDumper)
 
 
 @click.command("show")
@@ -939,13 +982,9 @@ def list_machines_cmd(ctx: click.Context, format: str) -> None:
     help="Output format",
 )
 @click.pass_context
+@_local_share_checked
 def show_machine_cmd(ctx: click.Context, hostname: str, format: str) -> None:
     """Show machine in active deployment."""
-    preflight_checks = [
-        LocalShareCheck(),
-    ]
-    run_preflight_checks(preflight_checks, console)
-
     deployment: MaasDeployment = ctx.obj
     client = MaasClient.from_deployment(deployment)
     machine = get_machine(client, hostname)
@@ -967,7 +1006,7 @@ def show_machine_cmd(ctx: click.Context, hostname: str, format: str) -> None:
         table.add_row(header.format("Status"), machine["status"])
         console.print(table)
     elif format == FORMAT_YAML:
-        console.print(yaml.dump(machine), end="")
+        yaml.dump(machine, sys.stdout, Dumper=YamlDumper)
 
 
 def _zones_table(zone_machines: dict[str, list[dict]]) -> Table:
@@ -998,17 +1037,21 @@ def _zones_roles_table(zone_machines: dict[str, list[dict]]) -> Table:
         title_style="bold",
         expand=True,
     )
-    for role in RoleTags.values():
+    roles = RoleTags.values()
+    for role in roles:
         machine_table.add_column(role, justify="center")
     machine_table.add_column("total", justify="center")
     for zone, machines in zone_machines.items():
         zone_table.add_row(zone)
-        role_count: Counter[str] = Counter()
+        role_count = dict.fromkeys(roles, 0)
         for machine in machines:
-            role_count.update(machine["roles"])
-        role_nb = [str(role_count.get(role, 0)) for role in RoleTags.values()]
-        role_nb += [str(len(machines))]  # total
-        machine_table.add_row(*role_nb)
+            for role in machine["roles"]:
+                if role in role_count:
+                    role_count[role] += 1
+        machine_table.add_row(
+            *(str(count) for count in role_count.values()),
+            str(len(machines)),  # total
+        )
 
     table.add_row(zone_table, machine_table)
     return table
@@ -1029,13 +1072,9 @@ def _zones_roles_table(zone_machines: dict[str, list[dict]]) -> Table:
     help="Output format",
 )
 @click.pass_context
+@_local_share_checked
 def list_zones_cmd(ctx: click.Context, roles: bool, format: str) -> None:
     """List zones in active deployment."""
-    preflight_checks = [
-        LocalShareCheck(),
-    ]
-    run_preflight_checks(preflight_checks, console)
-
     deployment: MaasDeployment = ctx.obj
     client = MaasClient.from_deployment(deployment)
 
@@ -1047,7 +1086,7 @@ def list_zones_cmd(ctx: click.Context, roles: bool, format: str) -> None:
             table = _zones_table(zones_machines)
         console.print(table)
     elif format == FORMAT_YAML:
-        console.print(yaml.dump(zones_machines), end="")
+        yaml.dump(zones_machines, sys.stdout, Dumper=YamlDumper)
 
 
 @click.command("list")
@@ -1058,13 +1097,9 @@ def list_zones_cmd(ctx: click.Context, roles: bool, format: str) -> None:
     help="Output format",
 )
 @click.pass_context
+@_local_share_checked
 def list_spaces_cmd(ctx: click.Context, format: str) -> None:
     """List spaces in MAAS deployment."""
-    preflight_checks = [
-        LocalShareCheck(),
-    ]
-    run_preflight_checks(preflight_checks, console)
-
     deployment: MaasDeployment = ctx.obj
     client = MaasClient.from_deployment(deployment)
     spaces = list_spaces(client)
@@ -1076,7 +1111,7 @@ def list_spaces_cmd(ctx: click.Context, format: str) -> None:
             table.add_row(space["name"], ", ".join(space["subnets"]))
         console.print(table)
     elif format == FORMAT_YAML:
-        console.print(yaml.dump(spaces), end="")
+        yaml.dump(spaces, sys.stdout, Dumper=YamlDumper)
 
 
 def _validate_mapping(
@@ -1111,20 +1146,14 @@ def _validate_mapping(
     callback=_validate_mapping,
 )
 @click.pass_context
+@_local_share_checked
 def map_spaces_cmd(ctx: click.Context, mapping: dict[Networks, str]):
     """Map space to network.
 
     Takes a list of mapping of space to network in the form of 'space:network'.
     If a space is given alone, it will be considered as the default space.
     """
-    preflight_checks = [
-        LocalShareCheck(),
-    ]
-    run_preflight_checks(preflight_checks, console)
-
-    snap = Snap()
-    deployment_location = deployment_path(snap)
-    deployments_config = DeploymentsConfig.load(deployment_location)
+    deployments_config = DeploymentsConfig.load(deployment_path(Snap()))
     deployment: MaasDeployment = ctx.obj
     client = MaasClient.from_deployment(deployment)
     map_spaces(deployments_config, deployment, client, mapping)
@@ -1136,16 +1165,10 @@ def map_spaces_cmd(ctx: click.Context, mapping: dict[Networks, str]):
     "networks", type=click.Choice(Networks.values()), required=True, nargs=-1
 )
 @click.pass_context
+@_local_share_checked
 def unmap_spaces_cmd(ctx: click.Context, networks: Sequence[str]) -> None:
     """Unmap space from network."""
-    preflight_checks = [
-        LocalShareCheck(),
-    ]
-    run_preflight_checks(preflight_checks, console)
-
-    snap = Snap()
-    deployment_location = deployment_path(snap)
-    deployments_config = DeploymentsConfig.load(deployment_location)
+    deployments_config = DeploymentsConfig.load(deployment_path(Snap()))
     deployment: MaasDeployment = ctx.obj
     unmap_spaces(
         deployments_config, deployment, [Networks(network) for network in networks]
@@ -1161,13 +1184,9 @@ def unmap_spaces_cmd(ctx: click.Context, networks: Sequence[str]) -> None:
     help="Output format",
 )
 @click.pass_context
+@_local_share_checked
 def list_networks_cmd(ctx: click.Context, format: str):
     """List networks and associated spaces."""
-    preflight_checks = [
-        LocalShareCheck(),
-    ]
-    run_preflight_checks(preflight_checks, console)
-
     deployment: MaasDeployment = ctx.obj
     mapping = get_network_mapping(deployment)
     if format == FORMAT_TABLE:
@@ -1178,7 +1197,7 @@ def list_networks_cmd(ctx: click.Context, format: str):
             table.add_row(network, space or "[italic]<unmapped>[italic]")
         console.print(table)
     elif format == FORMAT_YAML:
-        console.print(yaml.dump(mapping), end="")
+        yaml.dump(mapping, sys.stdout, Dumper=YamlDumper)
 
 
 def _colorize_result(result: DiagnosticsResult) -> str:
@@ -1224,6 +1243,43 @@ def _run_maas_checks(checks: list[DiagnosticsCheck], console: Console) -> list[d
     return check_results
 
 
+def _is_transient_maas_error(error: Exception) -> bool:
+    """Whether a MAAS API error is worth retrying."""
+    if isinstance(error, bones.CallError):
+        return error.status >= 500
+    return isinstance(error, OSError)
+
+
+def _run_check_with_retry(
+    check: DiagnosticsCheck,
+) -> DiagnosticsResult | list[DiagnosticsResult]:
+    """Run check, retrying on transient MAAS API errors.
+
+    Waits MAAS_CHECK_BACKOFF seconds before the first retry, doubling
+    on every attempt. When all attempts fail, the error is reported as a
+    failed result instead of aborting the whole validation.
+    """
+    delay = MAAS_CHECK_BACKOFF
+    attempt = 1
+    while True:
+        try:
+            return check.run()
+        except Exception as e:
+            if not _is_transient_maas_error(e):
+                raise
+            if attempt >= MAAS_CHECK_ATTEMPTS:
+                LOG.debug(f"Check {check.name!r} failed", exc_info=True)
+                return DiagnosticsResult.fail(
+                    check.name,
+                    f"failed after {attempt} attempts",
+                    str(e),
+                )
+            LOG.debug(f"Check {check.name!r} failed: {e}, retrying in {delay}s")
+            time.sleep(delay)
+            delay *= 2
+            attempt += 1
+
+
 def _run_maas_meta_checks(
     checks: list[DiagnosticsCheck], console: Console
 ) -> list[dict]:
@@ -1238,7 +1294,7 @@ def _run_maas_meta_checks(
         LOG.debug(f"Starting check {check.name!r}")
         message = f"{check.description}..."
         with console.status(message):
-            results = check.run()
+            results = _run_check_with_retry(check)
             if not results:
                 raise ValueError(f"{check.name!r} returned no results.")
             if isinstance(results, DiagnosticsResult):
@@ -1256,21 +1312,16 @@ def _save_report(snap: Snap, name: str, report: list[dict]) -> str:
         reports.mkdir(parents=True)
     report_path = reports / f"{name}-{datetime.now():%Y%m%d-%H%M%S.%f}.yaml"
     with report_path.open("w") as fd:
-        yaml.add_representer(str, str_presenter)
-        yaml.dump(report, fd)
+        yaml.dump(report, fd, Dumper=_ReportDumper)
     return str(report_path.absolute())
 
 
 @click.command("validate")
 @click.argument("machine", type=str)
 @click.pass_context
+@_local_share_checked
 def validate_machine_cmd(ctx: click.Context, machine: str):
     """Validate machine configuration."""
-    preflight_checks = [
-        LocalShareCheck(),
-    ]
-    run_preflight_checks(preflight_checks, console)
-
     deployment: MaasDeployment = ctx.obj
     snap = Snap()
 
@@ -1297,12 +1348,9 @@ def validate_machine_cmd(ctx: click.Context, machine: str):
 
 @click.command("validate")
 @click.pass_context
+@_local_share_checked
 def validate_deployment_cmd(ctx: click.Context):
     """Validate deployment."""
-    preflight_checks = [
-        LocalShareCheck(),
-    ]
-    run_preflight_checks(preflight_checks, console)
     snap = Snap()
     deployment: MaasDeployment = ctx.obj
     client = MaasClient.from_deployment(deployment)
@@ -1438,7 +1486,7 @@ def destroy_deployment_cmd(
         JujuSnapCheck(),
         LocalShareCheck(),
     ]
-    run_preflight_checks(preflight_checks, console)
+    run_preflight_checks_parallel(preflight_checks, console)
     deployments = DeploymentsConfig.load(deployment_path(Snap()))
     deployment: MaasDeployment = ctx.obj
     plan = []
@@ -13,12 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import ast
+import asyncio
 import base64
 import builtins
 import copy
 import ipaddress
 import logging
+import random
 import ssl
 import textwrap
 from pathlib import Path
@@ -80,6 +81,10 @@ from sunbeam.versions import JUJU_BASE
 
 LOG = logging.getLogger(__name__)
 console = Console()
+# Default maximum number of concurrent microceph actions against the Juju controller
+MICROCEPH_ACTIONS_CONCURRENCY = 5
+# Maximum delay per unit, in seconds, spreading add-osd actions over time
+MICROCEPH_ADD_OSD_JITTER = 0.1
 
 ROLES_NEEDED_ERROR = f"""A machine needs roles to be a part of an openstack deployment.
 Available roles are: {maas_deployment.RoleTags.values()}.
@@ -1582,20 +1587,13 @@ class MaasConfigureMicrocephOSDStep(BaseStep):
         self.model = model
         self.disks_to_configure: dict[str, list[str]] = {}
 
-    async def _list_disks(self, unit: str) -> tuple[dict, dict]:
+    def _parallelism(self, units: int) -> int:
+        """Number of units to run microceph actions on concurrently."""
+        return max(min(MICROCEPH_ACTIONS_CONCURRENCY, units), 1)
+
+    async def _list_disks(self, unit: str) -> tuple[list, list]:
         """Call list-disks action on an unit."""
-        LOG.debug("Running list-disks on : %r", unit)
-        action_result = await self.jhelper.run_action(unit, self.model, "list-disks")
-        LOG.debug(
-            "Result after running action list-disks on %r: %r",
-            unit,
-            action_result,
-        )
-        osds = ast.literal_eval(action_result.get("osds", "[]"))
-        unpartitioned_disks = ast.literal_eval(
-            action_result.get("unpartitioned-disks", "[]")
-        )
-        return osds, unpartitioned_disks
+        return await microceph.list_disks(self.jhelper, self.model, unit)
 
     async def _get_microceph_disks(self) -> dict:
         """Retrieve all disks added to microceph.
@@ -1625,8 +1623,34 @@ class MaasConfigureMicrocephOSDStep(BaseStep):
                 osd["path"]
             )
 
-        for name in self.names:
-            machine_id = str(self.client.cluster.get_node_info(name)["machineid"])
+        machine_ids = {
+            name: str(self.client.cluster.get_node_info(name)["machineid"])
+            for name in self.names
+        }
+        semaphore = asyncio.Semaphore(self._parallelism(len(self.names)))
+        results = await asyncio.gather(
+            *(
+                self._get_unit_disks(name, machine_id, semaphore)
+                for name, machine_id in machine_ids.items()
+            ),
+            return_exceptions=True,
+        )
+        for name, result in zip(machine_ids, results):
+            if isinstance(result, BaseException):
+                raise result
+            unit_name, unit_unpartitioned_disks = result
+            disks.setdefault(name, copy.deepcopy(default_disk))[
+                "unpartitioned_disks"
+            ].extend(uud["path"] for uud in unit_unpartitioned_disks)
+            disks[name]["unit"] = unit_name
+
+        return disks
+
+    async def _get_unit_disks(
+        self, name: str, machine_id: str, semaphore: asyncio.Semaphore
+    ) -> tuple[str, list]:
+        """Return the microceph unit on machine and its unpartitioned disks."""
+        async with semaphore:
             unit = await self.jhelper.get_unit_from_machine(
                 microceph.APPLICATION, machine_id, self.model
             )
@@ -1636,12 +1660,7 @@ class MaasConfigureMicrocephOSDStep(BaseStep):
                     " Is microceph deployed on this machine?"
                 )
             _, unit_unpartitioned_disks = await self._list_disks(unit.entity_id)
-            disks.setdefault(name, copy.deepcopy(default_disk))[
-                "unpartitioned_disks"
-            ].extend(uud["path"] for uud in unit_unpartitioned_disks)
-            disks[name]["unit"] = unit.entity_id
-
-        return disks
+        return unit.entity_id, unit_unpartitioned_disks
 
     def _get_maas_disks(self) -> dict:
         """Retrieve all disks from MAAS per machine.
@@ -1668,7 +1687,7 @@ class MaasConfigureMicrocephOSDStep(BaseStep):
         machine_osds = set(microceph_disks["osds"])
         machine_unpartitioned_disks = set(microceph_disks["unpartitioned_disks"])
         machine_unit = microceph_disks["unit"]
-        if len(maas_disks) == 0:
+        if not maas_disks:
             raise ValueError(
                 f"Machine {machine_unit!r} does not have any"
                 f" {maas_deployment.StorageTags.CEPH.value!r} disk defined."
@@ -1680,16 +1699,16 @@ class MaasConfigureMicrocephOSDStep(BaseStep):
         # Disks to partition
         disks_to_configure = maas_disks.intersection(machine_unpartitioned_disks)
 
-        if len(unknown_osds) > 0:
+        if unknown_osds:
             raise ValueError(
                 f"Machine {machine_unit!r} has OSDs from disks unknown to MAAS:"
                 f" {unknown_osds}"
             )
-        if len(missing_disks) > 0:
+        if missing_disks:
             raise ValueError(
                 f"Machine {machine_unit!r} is missing disks: {missing_disks}"
             )
-        if len(disks_to_configure) > 0:
+        if disks_to_configure:
             LOG.debug(
                 "Unit %r will configure the following disks: %r",
                 machine_unit,
@@ -1729,39 +1748,61 @@ class MaasConfigureMicrocephOSDStep(BaseStep):
                     exc_info=True,
                 )
                 return Result(ResultType.FAILED, str(e))
-            if len(machine_disks_to_configure) > 0:
+            if machine_disks_to_configure:
                 disks_to_configure[microceph_disks[name]["unit"]] = (
                     machine_disks_to_configure
                 )
 
-        if len(disks_to_configure) == 0:
+        if not disks_to_configure:
             LOG.debug("No disks to configure, skipping step.")
             return Result(ResultType.SKIPPED)
 
         self.disks_to_configure = disks_to_configure
         return Result(ResultType.COMPLETED)
 
+    async def _add_osd(
+        self, unit: str, disks: list[str], semaphore: asyncio.Semaphore
+    ) -> dict:
+        """Call add-osd action on an unit with all its disks at once."""
+        units = len(self.disks_to_configure)
+        if units > 1:
+            # Avoid synchronized bursts of actions against the controller,
+            # sleep before taking a slot so the slot is never held idle.
+            jitter = random.uniform(0, MICROCEPH_ADD_OSD_JITTER * units)  # noqa: S311
+            await asyncio.sleep(jitter)
+        async with semaphore:
+            LOG.debug("Running action add-osd on %r", unit)
+            action_result = await self.jhelper.run_action(
+                unit,
+                self.model,
+                "add-osd",
+                action_params={
+                    "device-id": ",".join(disks),
+                },
+            )
+        LOG.debug("Result after running action add-osd on %r: %r", unit, action_result)
+        return action_result
+
+    async def _add_osds(self) -> list[dict | BaseException]:
+        """Dispatch add-osd actions on all units concurrently."""
+        semaphore = asyncio.Semaphore(self._parallelism(len(self.disks_to_configure)))
+        return await asyncio.gather(
+            *(
+                self._add_osd(unit, disks, semaphore)
+                for unit, disks in self.disks_to_configure.items()
+            ),
+            return_exceptions=True,
+        )
+
     def run(self, status: Status | None = None) -> Result:
         """Configure local disks on microceph."""
-        for unit, disks in self.disks_to_configure.items():
-            try:
-                LOG.debug("Running action add-osd on %r", unit)
-                action_result = run_sync(
-                    self.jhelper.run_action(
-                        unit,
-                        self.model,
-                        "add-osd",
-                        action_params={
-                            "device-id": ",".join(disks),
-                        },
-                    )
-                )
-                LOG.debug(
-                    "Result after running action add-osd on %r: %r", unit, action_result
-                )
-            except (UnitNotFoundException, ActionFailedException) as e:
-                LOG.debug("Failed to run action add-osd on %r", unit, exc_info=True)
-                return Result(ResultType.FAILED, str(e))
+        results = run_sync(self._add_osds())
+        for unit, result in zip(self.disks_to_configure, results):
+            if isinstance(result, (UnitNotFoundException, ActionFailedException)):
+                LOG.debug("Failed to run action add-osd on %r", unit, exc_info=result)
+                return Result(ResultType.FAILED, str(result))
+            if isinstance(result, BaseException):
+                raise result
         return Result(ResultType.COMPLETED)
 
 
@@ -14,7 +14,10 @@
 # limitations under the License.
 
 import ast
+import copy
+import json
 import logging
+from operator import itemgetter
 from typing import Any
 
 from rich.console import Console
@@ -52,22 +55,76 @@ MICROCEPH_APP_TIMEOUT = 1200  # updating rgw configs can take some time
 MICROCEPH_UNIT_TIMEOUT = (
     1200  # 20 minutes, adding / removing units can take a long time
 )
+# Replica count used once enough storage nodes are available
+CEPH_MAX_REPLICA_SCALE = 3
+# Pools whose size is managed by SetCephMgrPoolSizeStep
+CEPH_MGR_POOLS: tuple[str, ...] = (
+    ".mgr",
+    ".rgw.root",
+    "default.rgw.log",
+    "default.rgw.control",
+    "default.rgw.meta",
+)
+CEPH_MGR_POOLS_CSV = ",".join(CEPH_MGR_POOLS)
+# Keep the optional pool size probe short, unhealthy mons can block ceph commands
+CEPH_POOL_QUERY_TIMEOUT = 30
+# (endpoint, network) pairs, a None endpoint sets the default space
+MICROCEPH_ENDPOINT_BINDINGS: tuple[tuple[str | None, Networks], ...] = (
+    (None, Networks.MANAGEMENT),
+    # microcluster related space
+    ("admin", Networks.MANAGEMENT),
+    ("peers", Networks.MANAGEMENT),
+    # internal activites for ceph services, heartbeat + replication
+    ("cluster", Networks.STORAGE_CLUSTER),
+    # access to ceph services
+    ("public", Networks.STORAGE),
+    # acess to ceph services for related applications
+    ("ceph", Networks.STORAGE),
+    # both mds and radosgw are specialized clients to access ceph services
+    # they will not be used by sunbeam,
+    # set them the same as other ceph clients
+    ("mds", Networks.STORAGE),
+    ("radosgw", Networks.STORAGE),
+)
+
+
+_MICROCEPH_QUESTIONS_TEMPLATE: dict[str, questions.PromptQuestion] = {
+    "osd_devices": questions.PromptQuestion(
+        "Ceph devices",
+        description=(
+            "Comma separated list of devices to be used by Ceph OSDs."
+            " `/dev/disk/by-id/<id>` are preferred, as they are stable"
+            " given the same device."
+        ),
+    ),
+}
 
 
 def microceph_questions():
+    # Question banks set answers and defaults on their questions,
+    # hand out copies so the template is never mutated.
     return {
-        "osd_devices": questions.PromptQuestion(
-            "Ceph devices",
-            description=(
-                "Comma separated list of devices to be used by Ceph OSDs."
-                " `/dev/disk/by-id/<id>` are preferred, as they are stable"
-                " given the same device."
-            ),
-        ),
+        key: copy.copy(question)
+        for key, question in _MICROCEPH_QUESTIONS_TEMPLATE.items()
     }
 
 
-async def list_disks(jhelper: JujuHelper, model: str, unit: str) -> tuple[dict, dict]:
+def parse_action_list(value: str | list) -> list:
+    """Parse a list out of an action result value.
+
+    Action results are usually flattened to strings, either as JSON or as
+    the python representation of the list. Structured values are returned
+    as is.
+    """
+    if isinstance(value, list):
+        return value
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return ast.literal_eval(value)
+
+
+async def list_disks(jhelper: JujuHelper, model: str, unit: str) -> tuple[list, list]:
     """Call list-disks action on an unit."""
     LOG.debug("Running list-disks on : %r", unit)
     action_result = await jhelper.run_action(unit, model, "list-disks")
@@ -76,15 +133,15 @@ async def list_disks(jhelper: JujuHelper, model: str, unit: str) -> tuple[dict,
         unit,
         action_result,
     )
-    osds = ast.literal_eval(action_result.get("osds", "[]"))
-    unpartitioned_disks = ast.literal_eval(
+    osds = parse_action_list(action_result.get("osds", "[]"))
+    unpartitioned_disks = parse_action_list(
         action_result.get("unpartitioned-disks", "[]")
     )
     return osds, unpartitioned_disks
 
 
 def ceph_replica_scale(storage_nodes: int) -> int:
-    return min(storage_nodes, 3)
+    return min(storage_nodes, CEPH_MAX_REPLICA_SCALE)
 
 
 class DeployMicrocephApplicationStep(DeployMachineApplicationStep):
@@ -121,7 +178,7 @@ class DeployMicrocephApplicationStep(DeployMachineApplicationStep):
     def extra_tfvars(self) -> dict:
         """Extra terraform vars to pass to terraform apply."""
         openstack_tfhelper = self.deployment.get_tfhelper("openstack-plan")
-        openstack_tf_output = openstack_tfhelper.output()
+        openstack_tf_output = openstack_tfhelper.cached_output()
 
         # Retreiving terraform state for non-existing plan using
         # data.terraform_remote_state errros out with message "No stored state
@@ -139,47 +196,19 @@ class DeployMicrocephApplicationStep(DeployMachineApplicationStep):
         traefik_rgw_offer_url = openstack_tf_output.get("ingress-rgw-offer-url")
         storage_nodes = self.client.cluster.list_nodes_by_role("storage")
 
+        spaces = {
+            network: self.deployment.get_space(network)
+            for network in {network for _, network in MICROCEPH_ENDPOINT_BINDINGS}
+        }
+        endpoint_bindings = [
+            {"endpoint": endpoint, "space": spaces[network]}
+            if endpoint is not None
+            else {"space": spaces[network]}
+            for endpoint, network in MICROCEPH_ENDPOINT_BINDINGS
+        ]
+
         tfvars: dict[str, Any] = {
-            "endpoint_bindings": [
-                {
-                    "space": self.deployment.get_space(Networks.MANAGEMENT),
-                },
-                {
-                    # microcluster related space
-                    "endpoint": "admin",
-                    "space": self.deployment.get_space(Networks.MANAGEMENT),
-                },
-                {
-                    "endpoint": "peers",
-                    "space": self.deployment.get_space(Networks.MANAGEMENT),
-                },
-                {
-                    # internal activites for ceph services, heartbeat + replication
-                    "endpoint": "cluster",
-                    "space": self.deployment.get_space(Networks.STORAGE_CLUSTER),
-                },
-                {
-                    # access to ceph services
-                    "endpoint": "public",
-                    "space": self.deployment.get_space(Networks.STORAGE),
-                },
-                {
-                    # acess to ceph services for related applications
-                    "endpoint": "ceph",
-                    "space": self.deployment.get_space(Networks.STORAGE),
-                },
-                # both mds and radosgw are specialized clients to access ceph services
-                # they will not be used by sunbeam,
-                # set them the same as other ceph clients
-                {
-                    "endpoint": "mds",
-                    "space": self.deployment.get_space(Networks.STORAGE),
-                },
-                {
-                    "endpoint": "radosgw",
-                    "space": self.deployment.get_space(Networks.STORAGE),
-                },
-            ],
+            "endpoint_bindings": endpoint_bindings,
             "charm_microceph_config": {"enable-rgw": "*", "namespace-projects": True},
         }
 
@@ -192,7 +221,7 @@ class DeployMicrocephApplicationStep(DeployMachineApplicationStep):
         if traefik_rgw_offer_url:
             tfvars["ingress-rgw-offer-url"] = traefik_rgw_offer_url
 
-        if len(storage_nodes):
+        if storage_nodes:
             tfvars["charm_microceph_config"]["default-pool-size"] = ceph_replica_scale(
                 len(storage_nodes)
             )
@@ -271,38 +300,60 @@ class ConfigureMicrocephOSDStep(BaseStep):
         self.accept_defaults = accept_defaults
         self.variables: dict = {}
         self.machine_id = ""
-        self.disks = ""
+        self.disks: frozenset[str] = frozenset()
         self.unpartitioned_disks: list[str] = []
         self.osd_disks: list[str] = []
+        self._unit_entity_id: str | None = None
+        self._unit_machine_id: str | None = None
 
     def microceph_config_questions(self):
         """Return questions for configuring microceph."""
-        disks_str = None
-        if len(self.unpartitioned_disks) > 0:
-            disks_str = ",".join(self.unpartitioned_disks)
+        disks_str = (
+            ",".join(self.unpartitioned_disks) if self.unpartitioned_disks else None
+        )
 
         questions = microceph_questions()
         # Specialise question with local disk information.
         questions["osd_devices"].default_value = disks_str
         return questions
 
+    async def _get_unit_entity_id(self) -> str:
+        """Return the microceph unit on the node, reusing a previous lookup."""
+        if self._unit_entity_id is None or self._unit_machine_id != self.machine_id:
+            unit = await self.jhelper.get_unit_from_machine(
+                APPLICATION, self.machine_id, self.model
+            )
+            self._unit_entity_id = unit.entity_id
+            self._unit_machine_id = self.machine_id
+        return self._unit_entity_id
+
+    async def _list_unit_disks(self) -> tuple[list, list]:
+        """Resolve the microceph unit on the node and list its disks."""
+        unit = await self._get_unit_entity_id()
+        return await list_disks(self.jhelper, self.model, unit)
+
+    async def _add_osd(self, disks: str) -> dict:
+        """Resolve the microceph unit on the node and add disks to it."""
+        unit = await self._get_unit_entity_id()
+        LOG.debug(f"Running action add-osd on {unit}")
+        return await self.jhelper.run_action(
+            unit,
+            self.model,
+            "add-osd",
+            action_params={
+                "device-id": disks,
+            },
+        )
+
     def get_all_disks(self) -> None:
         """Get all disks from microceph unit."""
         try:
             node = self.client.cluster.get_node_info(self.node_name)
             self.machine_id = str(node.get("machineid"))
-            unit = run_sync(
-                self.jhelper.get_unit_from_machine(
-                    APPLICATION, self.machine_id, self.model
-                )
-            )
-            osd_disks_dict, unpartitioned_disks_dict = run_sync(
-                list_disks(self.jhelper, self.model, unit.entity_id)
-            )
-            self.unpartitioned_disks = [
-                disk.get("path") for disk in unpartitioned_disks_dict
-            ]
-            self.osd_disks = [disk.get("path") for disk in osd_disks_dict]
+            osd_disks_dict, unpartitioned_disks_dict = run_sync(self._list_unit_disks())
+            get_path = itemgetter("path")
+            self.unpartitioned_disks = list(map(get_path, unpartitioned_disks_dict))
+            self.osd_disks = list(map(get_path, osd_disks_dict))
             LOG.debug(f"Unpartitioned disks: {self.unpartitioned_disks}")
             LOG.debug(f"OSD disks: {self.osd_disks}")
 
@@ -354,8 +405,9 @@ class ConfigureMicrocephOSDStep(BaseStep):
             show_hint=display_question_description,
         )
         # Microceph configuration
-        self.disks = microceph_config_bank.osd_devices.ask()
-        self.variables["microceph_config"][self.node_name]["osd_devices"] = self.disks
+        osd_devices = microceph_config_bank.osd_devices.ask()
+        self.variables["microceph_config"][self.node_name]["osd_devices"] = osd_devices
+        self.disks = frozenset(filter(None, (osd_devices or "").split(",")))
 
         LOG.debug(self.variables)
         questions.write_answers(self.client, self._CONFIG, self.variables)
@@ -381,8 +433,7 @@ class ConfigureMicrocephOSDStep(BaseStep):
             return Result(ResultType.SKIPPED)
 
         # Remove any disks that are already added
-        disks_to_add = set(self.disks.split(",")).difference(self.osd_disks)
-        self.disks = ",".join(disks_to_add)
+        self.disks = self.disks.difference(self.osd_disks)
         if not self.disks:
             LOG.debug("Skipping ConfigureMicrocephOSDStep as devices are already added")
             return Result(ResultType.SKIPPED)
@@ -392,33 +443,18 @@ class ConfigureMicrocephOSDStep(BaseStep):
     def run(self, status: Status | None = None) -> Result:
         """Configure local disks on microceph."""
         failed = False
+        disks = ",".join(sorted(self.disks))
         try:
-            unit = run_sync(
-                self.jhelper.get_unit_from_machine(
-                    APPLICATION, self.machine_id, self.model
-                )
-            )
-            LOG.debug(f"Running action add-osd on {unit.entity_id}")
-            action_result = run_sync(
-                self.jhelper.run_action(
-                    unit.entity_id,
-                    self.model,
-                    "add-osd",
-                    action_params={
-                        "device-id": self.disks,
-                    },
-                )
-            )
+            action_result = run_sync(self._add_osd(disks))
             LOG.debug(f"Result after running action add-osd: {action_result}")
         except UnitNotFoundException as e:
-            message = f"Microceph Adding disks {self.disks} failed: {str(e)}"
+            message = f"Microceph Adding disks {disks} failed: {str(e)}"
             failed = True
         except ActionFailedException as e:
-            message = f"Microceph Adding disks {self.disks} failed: {str(e)}"
+            message = f"Microceph Adding disks {disks} failed: {str(e)}"
             LOG.debug(message)
             try:
-                error = ast.literal_eval(str(e))
-                results = ast.literal_eval(error.get("result"))
+                results = parse_action_list(e.results["result"])
                 for result in results:
                     if result.get("status") == "failure":
                         # disk already added to microceph, ignore the error
@@ -450,6 +486,25 @@ class SetCephMgrPoolSizeStep(BaseStep):
         self.jhelper = jhelper
         self.model = model
         self.storage_nodes: list[dict] = []
+        self._leader_unit: str | None = None
+
+    def _pool_sizes_converged(self, unit: str, size: int) -> bool:
+        """Whether all mgr pools already have the expected size."""
+        cmd = "microceph.ceph osd pool ls detail --format json"
+        try:
+            result = run_sync(
+                self.jhelper.run_cmd_on_machine_unit(
+                    unit, self.model, cmd, timeout=CEPH_POOL_QUERY_TIMEOUT
+                )
+            )
+            pools = json.loads(result["stdout"])
+            sizes = {pool.get("pool_name"): pool.get("size") for pool in pools}
+        except Exception:
+            # Best effort probe, any failure means the step has to run
+            LOG.debug("Failed to query microceph pool sizes", exc_info=True)
+            return False
+
+        return all(sizes.get(pool) == size for pool in CEPH_MGR_POOLS)
 
     def is_skip(self, status: Status | None = None) -> Result:
         """Determines if the step should be skipped or not.
@@ -458,24 +513,32 @@ class SetCephMgrPoolSizeStep(BaseStep):
                 ResultType.COMPLETED or ResultType.FAILED otherwise
         """
         self.storage_nodes = self.client.cluster.list_nodes_by_role("storage")
-        if len(self.storage_nodes):
+        if not self.storage_nodes:
+            return Result(ResultType.SKIPPED)
+
+        try:
+            self._leader_unit = run_sync(
+                self.jhelper.get_leader_unit(APPLICATION, self.model)
+            )
+        except (ApplicationNotFoundException, LeaderNotFoundException):
+            LOG.debug("Failed to get microceph leader unit", exc_info=True)
             return Result(ResultType.COMPLETED)
 
-        return Result(ResultType.SKIPPED)
+        size = ceph_replica_scale(len(self.storage_nodes))
+        if self._pool_sizes_converged(self._leader_unit, size):
+            LOG.debug(f"Microceph mgr pools already have size {size}")
+            return Result(ResultType.SKIPPED)
+
+        return Result(ResultType.COMPLETED)
 
     def run(self, status: Status | None = None) -> Result:
         """Set ceph mgr pool size."""
         try:
-            pools = [
-                ".mgr",
-                ".rgw.root",
-                "default.rgw.log",
-                "default.rgw.control",
-                "default.rgw.meta",
-            ]
-            unit = run_sync(self.jhelper.get_leader_unit(APPLICATION, self.model))
+            unit = self._leader_unit
+            if unit is None:
+                unit = run_sync(self.jhelper.get_leader_unit(APPLICATION, self.model))
             action_params = {
-                "pools": ",".join(pools),
+                "pools": CEPH_MGR_POOLS_CSV,
                 "size": ceph_replica_scale(len(self.storage_nodes)),
             }
             LOG.debug(
@@ -489,14 +552,14 @@ class SetCephMgrPoolSizeStep(BaseStep):
             if result.get("status") is None:
                 return Result(
                     ResultType.FAILED,
-                    f"ERROR: Failed to update pool size for {pools}",
+                    f"ERROR: Failed to update pool size for {CEPH_MGR_POOLS}",
                 )
         except (
             ApplicationNotFoundException,
             LeaderNotFoundException,
             ActionFailedException,
         ) as e:
-            LOG.debug(f"Failed to update pool size for {pools}", exc_info=True)
+            LOG.debug(f"Failed to update pool size for {CEPH_MGR_POOLS}", exc_info=True)
             return Result(ResultType.FAILED, str(e))
 
         return Result(ResultType.COMPLETED)
@@ -13,6 +13,7 @@
 # limitations under the License.
 
 import asyncio
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
@@ -21,20 +22,31 @@ import sunbeam.commands.generate_cloud_config as generate
 import sunbeam.core.questions
 from sunbeam.core.common import ResultType
 
+_EXPECTED_CLOUDS_YAML = """clouds:
+  sunbeam:
+    auth:
+      auth_url: {auth_url}
+      password: {password}
+      project_domain_name: {project_domain_name}
+      project_name: {project_name}
+      user_domain_name: {user_domain_name}
+      username: {username}
+"""
 
-@pytest.fixture(autouse=True)
-def mock_run_sync(mocker):
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
 
+@pytest.fixture(scope="session")
+def event_loop_session(request):
+    loop = asyncio.new_event_loop()
+    request.addfinalizer(loop.close)
+    return loop
+
+
+@pytest.fixture(autouse=True)
+def mock_run_sync(mocker, event_loop_session):
     def run_sync(coro):
-        return loop.run_until_complete(coro)
+        return event_loop_session.run_until_complete(coro)
 
     mocker.patch("sunbeam.commands.generate_cloud_config.run_sync", run_sync)
-    yield
-    loop.close()
 
 
 @pytest.fixture()
@@ -115,21 +127,17 @@ class TestConfigureCloudsYamlStep:
         # Verify clouds.yaml contents and assert
         with open(clouds_yaml, "r") as f:
             contents = f.read()
-        expect = f"""clouds:
-  sunbeam:
-    auth:
-      auth_url: {admin_credentials["OS_AUTH_URL"]}
-      password: {creds["OS_PASSWORD"]}
-      project_domain_name: {creds["OS_PROJECT_DOMAIN_NAME"]}
-      project_name: {creds["OS_PROJECT_NAME"]}
-      user_domain_name: {creds["OS_USER_DOMAIN_NAME"]}
-      username: {creds["OS_USERNAME"]}
-"""
+        expect = _EXPECTED_CLOUDS_YAML.format(
+            auth_url=admin_credentials["OS_AUTH_URL"],
+            password=creds["OS_PASSWORD"],
+            project_domain_name=creds["OS_PROJECT_DOMAIN_NAME"],
+            project_name=creds["OS_PROJECT_NAME"],
+            user_domain_name=creds["OS_USER_DOMAIN_NAME"],
+            username=creds["OS_USERNAME"],
+        )
         assert contents == expect
 
-    def test_run_for_admin_user(self, tmp_path, cclient, tfhelper):
-        snap_real_home_dir = tmp_path
-        clouds_yaml = snap_real_home_dir / ".config" / "openstack" / "clouds.yaml"
+    def test_render_clouds_yaml_for_admin_user(self, cclient, tfhelper):
         admin_credentials = {
             "OS_AUTH_URL": "http://keystone:5000",
             "OS_USERNAME": "admin",
@@ -139,23 +147,25 @@ class TestConfigureCloudsYamlStep:
             "OS_PROJECT_NAME": "projectname",
         }
         step = generate.GenerateCloudConfigStep(
-            cclient, tfhelper, admin_credentials, "sunbeam", True, True, clouds_yaml
+            cclient,
+            tfhelper,
+            admin_credentials,
+            "sunbeam",
+            True,
+            True,
+            Path("clouds.yaml"),
+        )
+        cloud_config = {"clouds": step._generate_cloud_config(True, {})}
+        contents = step._render_clouds_yaml(cloud_config)
+
+        expect = _EXPECTED_CLOUDS_YAML.format(
+            auth_url=admin_credentials["OS_AUTH_URL"],
+            password=admin_credentials["OS_PASSWORD"],
+            project_domain_name=admin_credentials["OS_PROJECT_DOMAIN_NAME"],
+            project_name=admin_credentials["OS_PROJECT_NAME"],
+            user_domain_name=admin_credentials["OS_USER_DOMAIN_NAME"],
+            username=admin_credentials["OS_USERNAME"],
         )
-        step.run()
-
-        # Verify clouds.yaml contents and assert
-        with open(clouds_yaml, "r") as f:
-            contents = f.read()
-        expect = f"""clouds:
-  sunbeam:
-    auth:
-      auth_url: {admin_credentials["OS_AUTH_URL"]}
-      password: {admin_credentials["OS_PASSWORD"]}
-      project_domain_name: {admin_credentials["OS_PROJECT_DOMAIN_NAME"]}
-      project_name: {admin_credentials["OS_PROJECT_NAME"]}
-      user_domain_name: {admin_credentials["OS_USER_DOMAIN_NAME"]}
-      username: {admin_credentials["OS_USERNAME"]}
-"""
         assert contents == expect
 
     def test_run_with_update_false(self, cclient, tfhelper, environ, cprint):
@@ -175,14 +185,12 @@ class TestConfigureCloudsYamlStep:
         )
         step.run()
 
-        expect = f"""clouds:
-  sunbeam:
-    auth:
-      auth_url: {admin_credentials["OS_AUTH_URL"]}
-      password: {creds["OS_PASSWORD"]}
-      project_domain_name: {creds["OS_PROJECT_DOMAIN_NAME"]}
-      project_name: {creds["OS_PROJECT_NAME"]}
-      user_domain_name: {creds["OS_USER_DOMAIN_NAME"]}
-      username: {creds["OS_USERNAME"]}
-"""
+        expect = _EXPECTED_CLOUDS_YAML.format(
+            auth_url=admin_credentials["OS_AUTH_URL"],
+            password=creds["OS_PASSWORD"],
+            project_domain_name=creds["OS_PROJECT_DOMAIN_NAME"],
+            project_name=creds["OS_PROJECT_NAME"],
+            user_domain_name=creds["OS_USER_DOMAIN_NAME"],
+            username=creds["OS_USERNAME"],
+        )
         cprint.assert_called_with(expect)
@@ -17,7 +17,10 @@ import base64
 import grp
 import json
 import os
-from unittest.mock import Mock
+from unittest.mock import MagicMock, Mock
+
+import click
+import pytest
 
 from sunbeam.core import checks
 
@@ -353,3 +356,32 @@ class TestLxdControllerRegistrationCheck:
 
         assert result is False
         assert "Missing Juju controller on LXD" in check.message
+
+
+class TestRunPreflightChecksParallel:
+    def _check(self, name, passed):
+        check = Mock(description=name, message=f"{name} failed")
+        check.name = name
+        check.run.return_value = passed
+        return check
+
+    def test_all_checks_pass(self):
+        preflight_checks = [self._check("a", True), self._check("b", True)]
+
+        checks.run_preflight_checks_parallel(preflight_checks, MagicMock())
+
+        for check in preflight_checks:
+            check.run.assert_called_once()
+
+    def test_first_failure_in_order_is_raised(self):
+        preflight_checks = [
+            self._check("a", True),
+            self._check("b", False),
+            self._check("c", False),
+        ]
+
+        with pytest.raises(click.ClickException, match="b failed"):
+            checks.run_preflight_checks_parallel(preflight_checks, MagicMock())
+
+        for check in preflight_checks:
+            check.run.assert_called_once()
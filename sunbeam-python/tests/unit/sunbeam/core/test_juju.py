@@ -430,6 +430,16 @@ async def test_jhelper_run_action_failed(jhelper: juju.JujuHelper):
         await jhelper.run_action("k8s/1", "control-plane", "get-action")
 
 
+@pytest.mark.asyncio
+async def test_jhelper_run_action_failed_results(
+    jhelper: juju.JujuHelper, model: AsyncMock
+):
+    model.get_action_output.return_value = {"result": "[]", "return-code": 1}
+    with pytest.raises(juju.ActionFailedException) as e:
+        await jhelper.run_action("k8s/1", "control-plane", "get-action")
+    assert e.value.results == {"result": "[]", "return-code": 1}
+
+
 @pytest.mark.asyncio
 async def test_jhelper_scp_from(jhelper: juju.JujuHelper, units):
     unit = "k8s/0"
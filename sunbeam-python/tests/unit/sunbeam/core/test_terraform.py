@@ -12,6 +12,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import functools
+from pathlib import Path
 from unittest.mock import Mock, patch
 
 import pytest
@@ -144,3 +145,19 @@ class TestTerraformHelper:
         # Below are asserts for charm config parameters
         # Assert config values coming from extra_tfvars and in manifest
         assert applied_tfvars.get("glance-config") == {"ceph-osd-replication-count": 5}
+
+    def test_cached_output(self, mocker, snap):
+        mocker.patch.object(terraform_mod, "Snap", return_value=snap)
+        tfhelper = terraform_mod.TerraformHelper(Path("/tmp"), "openstack-plan", {})
+        output = mocker.patch.object(
+            tfhelper, "output", return_value={"keystone-endpoints-offer-url": "url"}
+        )
+        mocker.patch.object(terraform_mod.subprocess, "run")
+
+        assert tfhelper.cached_output() == {"keystone-endpoints-offer-url": "url"}
+        assert tfhelper.cached_output() == {"keystone-endpoints-offer-url": "url"}
+        output.assert_called_once()
+
+        tfhelper.apply()
+        tfhelper.cached_output()
+        assert output.call_count == 2
@@ -19,8 +19,10 @@ from unittest.mock import AsyncMock, MagicMock, Mock
 import pytest
 from maas.client.bones import CallError
 
+import sunbeam.provider.maas.client as maas_client
+import sunbeam.provider.maas.commands as maas_commands
 import sunbeam.provider.maas.steps as maas_steps
-from sunbeam.core.checks import DiagnosticResultType
+from sunbeam.core.checks import DiagnosticResultType, DiagnosticsResult
 from sunbeam.core.deployment import Networks
 from sunbeam.core.deployments import DeploymentsConfig
 from sunbeam.core.juju import ControllerNotFoundException
@@ -132,6 +134,107 @@ class TestAddMaasDeployment:
         assert result.result_type == ResultType.FAILED
 
 
+class TestMaasClient:
+    def test_connection_is_shared(self, mocker):
+        connect = mocker.patch(
+            "sunbeam.provider.maas.client.connect", side_effect=lambda *a, **kw: Mock()
+        )
+        maas_client._connect.cache_clear()
+        try:
+            first = maas_client.MaasClient("http://maas", "token")
+            second = maas_client.MaasClient("http://maas", "token", "tag")
+            other = maas_client.MaasClient("http://other", "token")
+        finally:
+            maas_client._connect.cache_clear()
+
+        assert first._client is second._client
+        assert other._client is not first._client
+        assert connect.call_count == 2
+        assert second.resource_tag == "tag"
+
+    def test_get_ip_ranges_from_space_lists_ranges_once(self):
+        client = Mock()
+        client.get_subnets.return_value = [
+            {"id": 1, "cidr": "10.0.0.0/24"},
+            {"id": 2, "cidr": "10.0.1.0/24"},
+            {"id": 3, "cidr": "10.0.2.0/24"},
+        ]
+        client.list_reserved_ip_ranges.return_value = {
+            1: [{"comment": "a", "start_ip": "10.0.0.10", "end_ip": "10.0.0.20"}],
+            2: [{"comment": "b", "start_ip": "10.0.1.10", "end_ip": "10.0.1.20"}],
+            4: [{"comment": "c", "start_ip": "10.0.3.10", "end_ip": "10.0.3.20"}],
+        }
+
+        ranges = maas_client.get_ip_ranges_from_space(client, "space")
+
+        assert ranges == {
+            "10.0.0.0/24": [{"label": "a", "start": "10.0.0.10", "end": "10.0.0.20"}],
+            "10.0.1.0/24": [{"label": "b", "start": "10.0.1.10", "end": "10.0.1.20"}],
+        }
+        client.list_reserved_ip_ranges.assert_called_once_with()
+
+
+class TestRunCheckWithRetry:
+    @pytest.fixture()
+    def sleep(self, mocker):
+        return mocker.patch.object(maas_commands.time, "sleep")
+
+    def test_retry_transient_error(self, sleep):
+        check = Mock()
+        result = DiagnosticsResult.success("check")
+        check.run.side_effect = [ConnectionRefusedError("refused"), result]
+
+        assert maas_commands._run_check_with_retry(check) is result
+        sleep.assert_called_once_with(maas_commands.MAAS_CHECK_BACKOFF)
+
+    def test_report_failure_after_all_attempts(self, sleep):
+        check = Mock()
+        check.name = "check"
+        check.run.side_effect = ConnectionRefusedError("refused")
+
+        result = maas_commands._run_check_with_retry(check)
+
+        assert result.passed == DiagnosticResultType.FAILURE
+        assert result.diagnostics == "refused"
+        assert check.run.call_count == maas_commands.MAAS_CHECK_ATTEMPTS
+        assert [c.args[0] for c in sleep.call_args_list] == [0.25, 0.5]
+
+    def test_non_transient_error_is_raised(self, sleep):
+        check = Mock()
+        check.run.side_effect = CallError(
+            request={"method": "GET", "uri": "http://localhost:5240/MAAS"},
+            response=Mock(status=401, reason="unauthorized"),
+            content=b"",
+            call=None,
+        )
+
+        with pytest.raises(CallError):
+            maas_commands._run_check_with_retry(check)
+        sleep.assert_not_called()
+
+
+class TestBucketNodesByRole:
+    def test_bucket_nodes_by_role(self):
+        nodes = [
+            {"name": "node1", "role": ["control", "compute", "storage"]},
+            {"name": "node2", "role": ["compute"]},
+            {"name": "node3", "role": None},
+            {"name": "node4"},
+            {"name": "node5", "role": ["storage", "compute"]},
+            {"name": "node6", "role": ["sunbeam"]},
+        ]
+
+        control, compute, storage, workers = maas_commands._bucket_nodes_by_role(nodes)
+
+        assert control == ["node1"]
+        assert compute == ["node1", "node2", "node5"]
+        assert storage == ["node1", "node5"]
+        assert workers == ["node1", "node2", "node5"]
+
+    def test_bucket_nodes_by_role_no_nodes(self):
+        assert maas_commands._bucket_nodes_by_role([]) == ([], [], [], [])
+
+
 class TestMachineRolesCheck:
     def test_run_with_no_assigned_roles(self):
         machine = {"hostname": "test_machine", "roles": []}
@@ -1044,6 +1147,10 @@ class TestMaasDeployInfraMachinesStep:
 
 
 class TestMaasConfigureMicrocephOSDStep:
+    @pytest.fixture(autouse=True)
+    def jitter(self, mocker):
+        return mocker.patch.object(maas_steps.random, "uniform", return_value=0.0)
+
     @pytest.fixture
     def jhelper(self):
         jhelper = Mock()
@@ -1227,6 +1334,42 @@ class TestMaasConfigureMicrocephOSDStep:
         result = step_with_disks.run()
         assert result.result_type == ResultType.COMPLETED
 
+    def test_run_one_action_per_unit(self, step_with_disks, jhelper):
+        step_with_disks.disks_to_configure = {
+            "unit/1": ["/dev/sdd"],
+            "unit/2": ["/dev/sdf", "/dev/sdg"],
+        }
+        jhelper.run_action = AsyncMock(return_value={"status": "completed"})
+        result = step_with_disks.run()
+        assert result.result_type == ResultType.COMPLETED
+        assert jhelper.run_action.call_count == 2
+        jhelper.run_action.assert_any_call(
+            "unit/2",
+            "test-model",
+            "add-osd",
+            action_params={"device-id": "/dev/sdf,/dev/sdg"},
+        )
+
+    def test_run_jitter_bounded_by_units(self, step_with_disks, jhelper, jitter):
+        step_with_disks.disks_to_configure = {
+            "unit/1": ["/dev/sdd"],
+            "unit/2": ["/dev/sdf", "/dev/sdg"],
+        }
+        jhelper.run_action = AsyncMock(return_value={"status": "completed"})
+        step_with_disks.run()
+        assert jitter.call_count == 2
+        jitter.assert_called_with(0, maas_steps.MICROCEPH_ADD_OSD_JITTER * 2)
+
+    def test_run_no_jitter_single_unit(self, step_with_disks, jhelper, jitter):
+        step_with_disks.disks_to_configure = {"unit/1": ["/dev/sdd"]}
+        jhelper.run_action = AsyncMock(return_value={"status": "completed"})
+        step_with_disks.run()
+        jitter.assert_not_called()
+
+    def test_parallelism(self, step):
+        assert step._parallelism(2) == 2
+        assert step._parallelism(20) == 5
+
     def test_run_failed_run_action(self, step_with_disks, jhelper):
         step_with_disks.disks_to_configure = {"unit/1": ["/dev/sdd"]}
         jhelper.run_action = AsyncMock(
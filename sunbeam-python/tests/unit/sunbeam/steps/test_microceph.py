@@ -13,13 +13,23 @@
 # limitations under the License.
 
 import asyncio
+import json
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 
 from sunbeam.core.common import ResultType
-from sunbeam.core.juju import ActionFailedException
-from sunbeam.steps.microceph import ConfigureMicrocephOSDStep, SetCephMgrPoolSizeStep
+from sunbeam.core.deployment import Networks
+from sunbeam.core.juju import ActionFailedException, CmdFailedException
+from sunbeam.steps.microceph import (
+    CEPH_MGR_POOLS,
+    CEPH_POOL_QUERY_TIMEOUT,
+    ConfigureMicrocephOSDStep,
+    DeployMicrocephApplicationStep,
+    SetCephMgrPoolSizeStep,
+    microceph_questions,
+    parse_action_list,
+)
 
 
 @pytest.fixture(autouse=True)
@@ -47,32 +57,107 @@ def jhelper():
     yield AsyncMock()
 
 
+@pytest.mark.parametrize(
+    "value",
+    [
+        [{"path": "/dev/sdb"}],
+        '[{"path": "/dev/sdb"}]',
+        "[{'path': '/dev/sdb'}]",
+    ],
+)
+def test_parse_action_list(value):
+    assert parse_action_list(value) == [{"path": "/dev/sdb"}]
+
+
+def test_microceph_questions_are_copies():
+    questions = microceph_questions()
+    questions["osd_devices"].default_value = "/dev/sdb"
+
+    assert microceph_questions()["osd_devices"].default_value is None
+
+
+class TestDeployMicrocephApplicationStep:
+    def test_extra_tfvars(self, cclient, jhelper):
+        deployment = Mock()
+        deployment.get_space.side_effect = lambda network: network.value
+        deployment.get_tfhelper.return_value.cached_output.return_value = {}
+        cclient.cluster.list_nodes_by_role.return_value = ["sunbeam1", "sunbeam2"]
+        step = DeployMicrocephApplicationStep(
+            deployment, cclient, Mock(), jhelper, Mock(), "test-model"
+        )
+        tfvars = step.extra_tfvars()
+
+        assert tfvars["endpoint_bindings"][0] == {"space": Networks.MANAGEMENT.value}
+        assert {
+            "endpoint": "radosgw",
+            "space": Networks.STORAGE.value,
+        } in tfvars["endpoint_bindings"]
+        assert len(tfvars["endpoint_bindings"]) == 8
+        assert tfvars["charm_microceph_config"]["default-pool-size"] == 2
+        # one lookup per distinct network
+        assert deployment.get_space.call_count == 3
+
+
 class TestConfigureMicrocephOSDStep:
+    def test_get_all_disks(self, cclient, jhelper):
+        cclient.cluster.get_node_info.return_value = {"machineid": 0}
+        jhelper.get_unit_from_machine.return_value = Mock(entity_id="microceph/0")
+        jhelper.run_action.return_value = {
+            "osds": '[{"path": "/dev/sdb"}]',
+            "unpartitioned-disks": '[{"path": "/dev/sdc"}]',
+        }
+        step = ConfigureMicrocephOSDStep(cclient, "test-0", jhelper, "test-model")
+        step.get_all_disks()
+
+        jhelper.run_action.assert_called_once_with(
+            "microceph/0", "test-model", "list-disks"
+        )
+        assert step.osd_disks == ["/dev/sdb"]
+        assert step.unpartitioned_disks == ["/dev/sdc"]
+
+        step.disks = frozenset({"/dev/sdc"})
+        result = step.run()
+
+        assert result.result_type == ResultType.COMPLETED
+        # unit resolved while listing disks is reused to add them
+        jhelper.get_unit_from_machine.assert_called_once()
+
     def test_is_skip(self, cclient, jhelper):
         step = ConfigureMicrocephOSDStep(cclient, "test-0", jhelper, "test-model")
-        step.disks = "/dev/sdb,/dev/sdc"
+        step.disks = frozenset({"/dev/sdb", "/dev/sdc"})
         result = step.is_skip()
 
         assert result.result_type == ResultType.COMPLETED
 
+    def test_is_skip_disks_already_added(self, cclient, jhelper):
+        step = ConfigureMicrocephOSDStep(cclient, "test-0", jhelper, "test-model")
+        step.disks = frozenset({"/dev/sdb", "/dev/sdc"})
+        step.osd_disks = ["/dev/sdb", "/dev/sdc"]
+        result = step.is_skip()
+
+        assert result.result_type == ResultType.SKIPPED
+
     def test_run(self, cclient, jhelper):
         step = ConfigureMicrocephOSDStep(cclient, "test-0", jhelper, "test-model")
-        step.disks = "/dev/sdb,/dev/sdc"
+        step.disks = frozenset({"/dev/sdb", "/dev/sdc"})
         result = step.run()
 
         jhelper.run_action.assert_called_once()
+        assert jhelper.run_action.call_args.kwargs["action_params"] == {
+            "device-id": "/dev/sdb,/dev/sdc"
+        }
         assert result.result_type == ResultType.COMPLETED
 
     def test_run_action_failed(self, cclient, jhelper):
         jhelper.run_action.side_effect = ActionFailedException("Action failed...")
 
         step = ConfigureMicrocephOSDStep(cclient, "test-0", jhelper, "test-model")
-        step.disks = "/dev/sdb,/dev/sdc"
+        step.disks = frozenset({"/dev/sdb", "/dev/sdc"})
         result = step.run()
 
         jhelper.run_action.assert_called_once()
         expected_message = (
-            f"Microceph Adding disks {step.disks} failed: Action failed..."
+            "Microceph Adding disks /dev/sdb,/dev/sdc failed: Action failed..."
         )
         assert result.result_type == ResultType.FAILED
         assert result.message == expected_message
@@ -83,10 +168,12 @@ class TestConfigureMicrocephOSDStep:
             'to record disk: This "disks" entry already exists\\n\'}]'
         )
         error_result = {"result": error_msg, "return-code": 0}
-        jhelper.run_action.side_effect = ActionFailedException(error_result)
+        jhelper.run_action.side_effect = ActionFailedException(
+            error_result, results=error_result
+        )
 
         step = ConfigureMicrocephOSDStep(cclient, "test-0", jhelper, "test-model")
-        step.disks = "/dev/sdb"
+        step.disks = frozenset({"/dev/sdb"})
         result = step.run()
 
         jhelper.run_action.assert_called_once()
@@ -103,6 +190,51 @@ class TestSetCephMgrPoolSizeStep:
 
     def test_is_skip_with_storage_nodes(self, cclient, jhelper):
         cclient.cluster.list_nodes_by_role.return_value = ["sunbeam1"]
+        jhelper.run_cmd_on_machine_unit.return_value = {
+            "stdout": json.dumps(
+                [{"pool_name": pool, "size": 3} for pool in CEPH_MGR_POOLS]
+            )
+        }
+        step = SetCephMgrPoolSizeStep(cclient, jhelper, "test-model")
+        result = step.is_skip()
+
+        assert result.result_type == ResultType.COMPLETED
+
+    def test_is_skip_pool_size_converged(self, cclient, jhelper):
+        cclient.cluster.list_nodes_by_role.return_value = ["sunbeam1"]
+        jhelper.run_cmd_on_machine_unit.return_value = {
+            "stdout": json.dumps(
+                [{"pool_name": pool, "size": 1} for pool in CEPH_MGR_POOLS]
+            )
+        }
+        step = SetCephMgrPoolSizeStep(cclient, jhelper, "test-model")
+        result = step.is_skip()
+
+        assert result.result_type == ResultType.SKIPPED
+
+    def test_is_skip_pool_size_query_failed(self, cclient, jhelper):
+        cclient.cluster.list_nodes_by_role.return_value = ["sunbeam1"]
+        jhelper.run_cmd_on_machine_unit.side_effect = CmdFailedException("failed")
+        step = SetCephMgrPoolSizeStep(cclient, jhelper, "test-model")
+        result = step.is_skip()
+
+        assert result.result_type == ResultType.COMPLETED
+
+    def test_is_skip_pool_size_query_timeout(self, cclient, jhelper):
+        cclient.cluster.list_nodes_by_role.return_value = ["sunbeam1"]
+        jhelper.run_cmd_on_machine_unit.side_effect = asyncio.TimeoutError()
+        step = SetCephMgrPoolSizeStep(cclient, jhelper, "test-model")
+        result = step.is_skip()
+
+        assert result.result_type == ResultType.COMPLETED
+        assert (
+            jhelper.run_cmd_on_machine_unit.call_args.kwargs["timeout"]
+            == CEPH_POOL_QUERY_TIMEOUT
+        )
+
+    def test_is_skip_pool_size_unexpected_payload(self, cclient, jhelper):
+        cclient.cluster.list_nodes_by_role.return_value = ["sunbeam1"]
+        jhelper.run_cmd_on_machine_unit.return_value = {"stdout": "42"}
         step = SetCephMgrPoolSizeStep(cclient, jhelper, "test-model")
         result = step.is_skip()
 
@@ -116,6 +248,19 @@ class TestSetCephMgrPoolSizeStep:
         jhelper.run_action.assert_called_once()
         assert result.result_type == ResultType.COMPLETED
 
+    def test_run_reuses_leader_from_is_skip(self, cclient, jhelper):
+        cclient.cluster.list_nodes_by_role.return_value = ["sunbeam1"]
+        jhelper.get_leader_unit.return_value = "microceph/0"
+        jhelper.run_cmd_on_machine_unit.return_value = {"stdout": "[]"}
+        jhelper.run_action.return_value = {"status": "completed"}
+        step = SetCephMgrPoolSizeStep(cclient, jhelper, "test-model")
+        assert step.is_skip().result_type == ResultType.COMPLETED
+        result = step.run()
+
+        jhelper.get_leader_unit.assert_called_once()
+        assert jhelper.run_action.call_args.args[0] == "microceph/0"
+        assert result.result_type == ResultType.COMPLETED
+
     def test_run_action_failed(self, cclient, jhelper):
         jhelper.run_action.side_effect = ActionFailedException("Action failed...")
 
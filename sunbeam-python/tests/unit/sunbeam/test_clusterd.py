@@ -589,6 +589,28 @@ class TestClusterService:
         nodes_from_mock = [node.get("name") for node in json_data.get("metadata")]
         assert nodes_from_mock == nodes_from_call
 
+    def test_list_nodes_by_role_is_cached(self):
+        json_data = {
+            "type": "sync",
+            "status": "Success",
+            "status_code": 200,
+            "metadata": [{"name": "node-1", "role": ["storage"], "machineid": 0}],
+        }
+        mock_session = MagicMock()
+        mock_session.request.return_value = self._mock_response(
+            status=200, json_data=json_data
+        )
+
+        cs = ClusterService(mock_session, "http+unix://mock")
+        assert cs.list_nodes_by_role("storage") == json_data["metadata"]
+        assert cs.list_nodes_by_role("storage") == json_data["metadata"]
+        assert mock_session.request.call_count == 1
+
+        cs.update_node_info("node-1", ["control"], 0)
+        cs.list_nodes_by_role("storage")
+        # update + refreshed listing
+        assert mock_session.request.call_count == 3
+
     def test_update_node_info(self):
         json_data = {
             "type": "sync",